@@ -1,18 +1,54 @@
 from __future__ import annotations
 
+from collections import Counter, OrderedDict, defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Tuple
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Tuple
 import os
 import json
 import random
-import tempfile
+import re
+import subprocess
+import sys
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, smart search falls back to pure Python
+    np = None
+
+try:
+    from numba import njit, types
+    from numba.extending import intrinsic
+except ImportError:  # numba is optional, smart search falls back to numpy
+    njit = None
+
+try:
+    from PIL import Image, ImageTk
+except ImportError:  # Pillow is optional, covers are then loaded by tk.PhotoImage
+    Image = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the stdlib json module is used instead
+    orjson = None
+
 
 # ========== DATA MODEL ==========
 
-@dataclass
+# largest duration the int64 numeric columns can hold
+MAX_DURATION_SECONDS = 2**63 - 1
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> frozenset[str]:
+    """Case-insensitive set of the words in text, punctuation ignored."""
+    return frozenset(_TOKEN_RE.findall(text.casefold()))
+
+
+@dataclass(slots=True)
 class Song:
     """Represents a single song in the collection."""
     title: str
@@ -23,33 +59,58 @@ class Song:
     filepath: str = ""      # path to audio file (optional)
     cover_path: str = ""    # path to album image (PNG preferred)
     id: int = field(default_factory=int)
+    _tokens: frozenset[str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _title_lower: str = field(default="", init=False, repr=False, compare=False)
+    _display: str = field(default="", init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.duration_seconds < 0:
             raise ValueError("Duration must be non-negative.")
+        if self.duration_seconds > MAX_DURATION_SECONDS:
+            raise ValueError(f"Duration must be at most {MAX_DURATION_SECONDS} seconds.")
         if not (1 <= self.rating <= 5):
             raise ValueError("Rating must be between 1 and 5.")
+        self._title_lower = self.title.lower()
 
     @property
     def duration_minutes(self) -> float:
         return self.duration_seconds / 60.0
 
+    @property
+    def tokens(self) -> frozenset[str]:
+        """Title+artist words (see tokenize), computed once and cached."""
+        if self._tokens is None:
+            self._tokens = tokenize(f"{self.title} {self.artist}")
+        return self._tokens
+
+    @property
+    def display_text(self) -> str:
+        """Row text shown in the song list, computed once and cached."""
+        if not self._display:
+            has_file = "🎵" if self.filepath else "—"
+            self._display = (
+                f"[{self.id}] {self.title} – {self.artist} "
+                f"({self.genre}, {self.duration_seconds}s, "
+                f"rating {self.rating}, file {has_file})"
+            )
+        return self._display
+
     def similarity_score(self, keyword: str) -> float:
         """
         'Clever' algorithm:
         Computes how similar a keyword is to title+artist using words.
         Score 0..1 (higher = more similar).
         """
-        kw_words = set(keyword.lower().split())
-        text = f"{self.title} {self.artist}".lower()
-        song_words = set(text.split())
+        return self.similarity_score_set(tokenize(keyword))
 
-        if not kw_words or not song_words:
+    def similarity_score_set(self, kw_set: frozenset[str]) -> float:
+        """Same as similarity_score, but takes an already tokenized keyword."""
+        song_words = self.tokens
+        if not kw_set or not song_words:
             return 0.0
-
-        common = kw_words & song_words
-        union = kw_words | song_words
-        return len(common) / len(union)
+        return len(kw_set & song_words) / len(kw_set | song_words)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -77,12 +138,127 @@ class Song:
         )
 
 
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    # compact separators, to match orjson's output byte for byte
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(buf: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(buf)
+
+
+if np is not None:
+    _POPCOUNT_16 = np.array([bin(i).count("1") for i in range(1 << 16)], dtype=np.uint8)
+
+
+def _popcount_rows(mat: Any) -> Any:
+    """Number of set bits in each row of a 2-D uint64 array."""
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return np.bitwise_count(mat).sum(axis=1, dtype=np.int64)
+    return _POPCOUNT_16[mat.view(np.uint16)].sum(axis=1, dtype=np.int64)
+
+
+# MinHash with (a*x + b) % p universal hashes; a, b, x < 2**32 keep a*x + b in uint64
+MINHASH_PERMUTATIONS = 64
+APPROX_MIN_SONGS = 10_000
+_MINHASH_PRIME = 4294967311  # smallest prime above 2**32
+if np is not None:
+    _minhash_rng = np.random.default_rng(0)
+    _MINHASH_A = _minhash_rng.integers(1, 1 << 32, MINHASH_PERMUTATIONS, dtype=np.uint64)
+    _MINHASH_B = _minhash_rng.integers(0, 1 << 32, MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+
+def _minhash_signature(tokens: frozenset[str]) -> Any:
+    """MINHASH_PERMUTATIONS-long uint64 MinHash signature of a token set."""
+    if not tokens:
+        # hash values are < p, so an empty set never matches anything
+        return np.full(MINHASH_PERMUTATIONS, _MINHASH_PRIME, dtype=np.uint64)
+    x = np.array([hash(tok) & 0xFFFFFFFF for tok in tokens], dtype=np.uint64)
+    hashed = (_MINHASH_A[:, None] * x + _MINHASH_B[:, None]) % np.uint64(_MINHASH_PRIME)
+    # kept as uint64: values in [2**32, p) would collide if narrowed to uint32
+    return hashed.min(axis=1)
+
+
+if njit is not None and np is not None:
+    @intrinsic
+    def _ctpop64(typingctx, x):
+        sig = types.uint64(types.uint64)
+
+        def codegen(context, builder, signature, args):
+            return builder.ctpop(args[0])
+
+        return sig, codegen
+
+    # serial on purpose: searches only score a few candidate rows, where
+    # thread start-up would cost more than it saves
+    @njit(cache=True)
+    def jaccard_scores(mat, q, unknown):
+        """Jaccard of q against every row of mat, without (K, W) temporaries."""
+        n, width = mat.shape
+        out = np.zeros(n, dtype=np.float64)
+        for i in range(n):
+            common = 0
+            union = unknown
+            for j in range(width):
+                common += _ctpop64(mat[i, j] & q[j])
+                union += _ctpop64(mat[i, j] | q[j])
+            if common:
+                out[i] = common / union
+        return out
+
+    def _warm_up_jaccard() -> None:
+        """Compile (or load from cache) jaccard_scores for the types search uses."""
+        mat = np.frombuffer(bytes(8), dtype="<u8").reshape(1, 1)
+        q = np.frombuffer(bytes(8), dtype="<u8")
+        jaccard_scores(mat, q, 0)
+else:
+    jaccard_scores = None
+    _warm_up_jaccard = None
+
+
+SEARCH_CACHE_SIZE = 128
+
+
 class SongCollector:
     """Stores all songs and provides operations over them."""
 
     def __init__(self) -> None:
         self._songs: List[Song] = []
+        self._by_id: Dict[int, Song] = {}
+        # song id -> position in self._songs
+        self._index: Dict[int, int] = {}
         self._next_id: int = 1
+        self._total_seconds: int = 0
+        self._genre_counts: Counter[str] = Counter()
+        # token -> bit position, and song id -> bitset of its tokens
+        self._vocab: Dict[str, int] = {}
+        # bit positions released by tokens no song uses any more
+        self._free_bits: List[int] = []
+        self._song_bits: Dict[int, int] = {}
+        # token -> ids of the songs containing it (inverted index)
+        self._postings: defaultdict[str, set[int]] = defaultdict(set)
+        # MinHash signatures per song id, and stacked in self._songs order
+        # for the version they were built at (numpy only, built lazily)
+        self._song_sigs: Dict[int, Any] = {}
+        self._minhash: Any = None
+        self._minhash_version: int = -1
+        # sort key the list is currently ordered by, None once songs change
+        self._sorted_by: str | None = None
+        # bumped on every change to the songs or their order
+        self._version: int = 0
+        # keyword tokens -> search_smart results at _search_cache_version,
+        # least recently used first
+        self._search_cache: OrderedDict[frozenset[str], Tuple[Song, ...]] = OrderedDict()
+        self._search_cache_version: int = 0
+        # numeric columns parallel to self._songs (numpy only), with spare capacity
+        self._ids: Any = None
+        self._durations: Any = None
+        self._ratings: Any = None
+        self._rebuild_columns()
 
     # ----- CRUD -----
     def add_song(
@@ -105,22 +281,63 @@ class SongCollector:
             filepath=filepath,
             cover_path=cover_path,
         )
+        # columns first: they are the only step that can fail (overflow)
+        self._append_columns(song)
+        self._index[song.id] = len(self._songs)
         self._songs.append(song)
+        self._by_id[song.id] = song
+        self._total_seconds += duration_seconds
+        self._genre_counts[genre] += 1
+        self._sorted_by = None
+        self._version += 1
+        self._index_tokens(song)
         self._next_id += 1
         return song
 
     def remove_song_by_id(self, song_id: int) -> bool:
-        for s in self._songs:
-            if s.id == song_id:
-                self._songs.remove(s)
-                return True
-        return False
+        song = self._by_id.pop(song_id, None)
+        if song is None:
+            return False
+        # move the last song into the freed slot instead of shifting the list
+        index = self._index.pop(song_id)
+        last = self._songs.pop()
+        if index < len(self._songs):
+            self._songs[index] = last
+            self._index[last.id] = index
+            self._sorted_by = None
+        self._move_last_column(index)
+        self._version += 1
+        self._total_seconds -= song.duration_seconds
+        self._discount_genre(song.genre)
+        self._unindex_tokens(song)
+        return True
+
+    def remove_songs_by_ids(self, ids: Iterable[int]) -> int:
+        """
+        Remove several songs in a single pass, keeping the order of the rest.
+        Returns the number of songs removed.
+        """
+        removed = [self._by_id.pop(i) for i in set(ids) if i in self._by_id]
+        if not removed:
+            return 0
+        gone = {s.id for s in removed}
+        self._songs = [s for s in self._songs if s.id not in gone]
+        self._index = {s.id: i for i, s in enumerate(self._songs)}
+        self._rebuild_columns()
+        for song in removed:
+            self._total_seconds -= song.duration_seconds
+            self._discount_genre(song.genre)
+            self._unindex_tokens(song)
+        self._version += 1
+        return len(removed)
+
+    def _discount_genre(self, genre: str) -> None:
+        self._genre_counts[genre] -= 1
+        if self._genre_counts[genre] == 0:
+            del self._genre_counts[genre]
 
     def get_song_by_id(self, song_id: int) -> Song | None:
-        for s in self._songs:
-            if s.id == song_id:
-                return s
-        return None
+        return self._by_id.get(song_id)
 
     def list_songs(self) -> List[Song]:
         return list(self._songs)
@@ -144,68 +361,321 @@ class SongCollector:
         song = self.get_song_by_id(song_id)
         if song is None:
             return False
+        if not (0 <= duration_seconds <= MAX_DURATION_SECONDS):
+            raise ValueError(
+                f"Duration must be between 0 and {MAX_DURATION_SECONDS} seconds."
+            )
+        if self._ids is not None:
+            index = self._index[song_id]
+            self._durations[index] = duration_seconds
+            self._ratings[index] = rating
+        self._unindex_tokens(song)
         song.title = title
         song.artist = artist
+        self._total_seconds += duration_seconds - song.duration_seconds
         song.duration_seconds = duration_seconds
+        if genre != song.genre:
+            self._discount_genre(song.genre)
+            self._genre_counts[genre] += 1
         song.genre = genre
         song.rating = rating
         song.filepath = filepath
         song.cover_path = cover_path
+        song._tokens = None
+        song._title_lower = title.lower()
+        song._display = ""
+        self._sorted_by = None
+        self._version += 1
+        self._index_tokens(song)
         return True
 
+    # ----- numeric columns -----
+    @staticmethod
+    def _build_columns(songs: List[Song]) -> Tuple[Any, Any, Any]:
+        """id, duration and rating columns for songs, or Nones without numpy."""
+        if np is None:
+            return None, None, None
+        n = len(songs)
+        capacity = max(16, n)
+        # int64 throughout: Song only checks durations are non-negative
+        ids = np.zeros(capacity, dtype=np.int64)
+        durations = np.zeros(capacity, dtype=np.int64)
+        ratings = np.zeros(capacity, dtype=np.int64)
+        ids[:n] = [s.id for s in songs]
+        durations[:n] = [s.duration_seconds for s in songs]
+        ratings[:n] = [s.rating for s in songs]
+        return ids, durations, ratings
+
+    def _rebuild_columns(self) -> None:
+        self._ids, self._durations, self._ratings = self._build_columns(self._songs)
+
+    def _append_columns(self, song: Song) -> None:
+        """Store song in the row after the last one, growing the columns 2x if full."""
+        if self._ids is None:
+            return
+        n = len(self._songs)
+        if n == len(self._ids):
+            self._ids = np.concatenate([self._ids, np.zeros_like(self._ids)])
+            self._durations = np.concatenate([self._durations, np.zeros_like(self._durations)])
+            self._ratings = np.concatenate([self._ratings, np.zeros_like(self._ratings)])
+        self._ids[n] = song.id
+        self._durations[n] = song.duration_seconds
+        self._ratings[n] = song.rating
+
+    def _move_last_column(self, index: int) -> None:
+        """Mirror remove_song_by_id: the row past the end now lives at index."""
+        if self._ids is None:
+            return
+        n = len(self._songs)
+        if index < n:
+            for col in (self._ids, self._durations, self._ratings):
+                col[index] = col[n]
+
+    def _index_tokens(self, song: Song) -> None:
+        bits = 0
+        for tok in song.tokens:
+            idx = self._vocab.get(tok)
+            if idx is None:
+                idx = self._free_bits.pop() if self._free_bits else len(self._vocab)
+                self._vocab[tok] = idx
+            bits |= 1 << idx
+        self._song_bits[song.id] = bits
+        for tok in song.tokens:
+            self._postings[tok].add(song.id)
+
+    def _unindex_tokens(self, song: Song) -> None:
+        del self._song_bits[song.id]
+        self._song_sigs.pop(song.id, None)
+        for tok in song.tokens:
+            posting = self._postings[tok]
+            posting.discard(song.id)
+            if not posting:
+                del self._postings[tok]
+                self._free_bits.append(self._vocab.pop(tok))
+        if len(self._free_bits) > max(64, len(self._vocab)):
+            self._compact_vocab()
+
+    def _compact_vocab(self) -> None:
+        """Renumber live tokens 0..len(vocab)-1 so bitsets shrink after churn."""
+        self._vocab = {tok: i for i, tok in enumerate(self._postings)}
+        self._free_bits = []
+        bits = dict.fromkeys(self._song_bits, 0)
+        for tok, idx in self._vocab.items():
+            for song_id in self._postings[tok]:
+                bits[song_id] |= 1 << idx
+        self._song_bits = bits
+
+    def _words_per_row(self) -> int:
+        # every position below len(vocab) + len(free) is either live or free
+        return max(1, (len(self._vocab) + len(self._free_bits) + 63) // 64)
+
     # ----- sorting -----
     def sort_songs(self, key: str) -> None:
-        if key == "Title":
-            self._songs.sort(key=lambda s: s.title.lower())
+        if key == self._sorted_by:
+            return
+        if self._ids is not None and key in ("Duration", "Rating", "Newest", "Oldest"):
+            self._sort_by_columns(key)
+        elif key == "Title":
+            self._songs.sort(key=attrgetter("_title_lower"))
+            self._rebuild_columns()
         elif key == "Duration":
-            self._songs.sort(key=lambda s: s.duration_seconds)
+            self._songs.sort(key=attrgetter("duration_seconds"))
         elif key == "Rating":
-            self._songs.sort(key=lambda s: s.rating, reverse=True)
+            self._songs.sort(key=attrgetter("rating"), reverse=True)
         elif key == "Newest":
-            self._songs.sort(key=lambda s: s.id, reverse=True)
+            self._songs.sort(key=attrgetter("id"), reverse=True)
         elif key == "Oldest":
-            self._songs.sort(key=lambda s: s.id)
+            self._songs.sort(key=attrgetter("id"))
+        else:
+            return
+        self._index = {s.id: i for i, s in enumerate(self._songs)}
+        self._sorted_by = key
+        self._version += 1
+
+    def _sort_by_columns(self, key: str) -> None:
+        n = len(self._songs)
+        if key == "Duration":
+            order = np.argsort(self._durations[:n], kind="stable")
+        elif key == "Rating":
+            order = np.argsort(-self._ratings[:n], kind="stable")
+        elif key == "Newest":
+            order = np.argsort(-self._ids[:n], kind="stable")
+        else:
+            order = np.argsort(self._ids[:n], kind="stable")
+        self._songs = [self._songs[i] for i in order.tolist()]
+        for col in (self._ids, self._durations, self._ratings):
+            col[:n] = col[order]
 
     # ----- searching -----
     def search_smart(self, keyword: str) -> List[Song]:
-        scored: List[Tuple[Song, float]] = [
-            (s, s.similarity_score(keyword)) for s in self._songs
-        ]
-        scored = [(s, score) for s, score in scored if score > 0.0]
+        kw_set = tokenize(keyword)
+        # results are only valid for the version they were computed at
+        if self._search_cache_version != self._version:
+            self._search_cache.clear()
+            self._search_cache_version = self._version
+        results = self._search_cache.get(kw_set)
+        if results is not None:
+            self._search_cache.move_to_end(kw_set)
+        else:
+            results = tuple(self._search_smart(kw_set))
+            if len(self._search_cache) >= SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)  # least recently used
+            self._search_cache[kw_set] = results
+        return list(results)
+
+    def _search_smart(self, kw_set: frozenset[str]) -> List[Song]:
+        if not kw_set:
+            return []
+        # Jaccard over token bitsets; keyword words unknown to the vocabulary
+        # can't match anything but still count towards the union.
+        kw_bits = 0
+        unknown = 0
+        for tok in kw_set:
+            idx = self._vocab.get(tok)
+            if idx is None:
+                unknown += 1
+            else:
+                kw_bits |= 1 << idx
+        # only songs sharing at least one word with the keyword can score > 0
+        candidates = set().union(*(self._postings.get(tok, ()) for tok in kw_set))
+        if not candidates:
+            return []
+        positions = sorted(self._index[song_id] for song_id in candidates)
+        if np is not None:
+            return self._search_bits_numpy(kw_bits, unknown, positions)
+        scored: List[Tuple[Song, float]] = []
+        for i in positions:
+            s = self._songs[i]
+            sb = self._song_bits[s.id]
+            common = (kw_bits & sb).bit_count()
+            scored.append((s, common / ((kw_bits | sb).bit_count() + unknown)))
         scored.sort(key=lambda pair: pair[1], reverse=True)
         return [s for s, _ in scored]
 
+    def _search_bits_numpy(
+        self, kw_bits: int, unknown: int, positions: List[int]
+    ) -> List[Song]:
+        """Vectorized Jaccard of kw_bits against the songs at positions."""
+        # pack only the candidates' bitsets; nothing else is ever scored
+        nbytes = self._words_per_row() * 8
+        songs, song_bits = self._songs, self._song_bits
+        buf = b"".join(song_bits[songs[i].id].to_bytes(nbytes, "little") for i in positions)
+        mat = np.frombuffer(buf, dtype="<u8").reshape(len(positions), nbytes // 8)
+        kw_row = np.frombuffer(kw_bits.to_bytes(nbytes, "little"), dtype="<u8")
+        if jaccard_scores is not None:
+            scores = jaccard_scores(mat, kw_row, unknown)
+        else:
+            common = _popcount_rows(mat & kw_row)
+            union = _popcount_rows(mat | kw_row) + unknown
+            scores = common / union
+        # stable sort keeps list order for equal scores, like list.sort does
+        order = np.argsort(-scores, kind="stable")
+        return [self._songs[positions[i]] for i in order.tolist()]
+
+    def search_approx(self, keyword: str, topk: int = 50) -> List[Song]:
+        """
+        Opt-in alternative to search_smart: up to topk songs most similar to
+        keyword, ranked by MinHash estimates of the Jaccard score. Small
+        libraries (or no numpy) get the exact search_smart top k instead.
+        """
+        if np is None or len(self._songs) < APPROX_MIN_SONGS:
+            return self.search_smart(keyword)[:topk]
+        kw_set = tokenize(keyword)
+        if not kw_set or topk <= 0:
+            return []
+        est = (self._get_minhash() == _minhash_signature(kw_set)).mean(axis=1)
+        k = min(topk, len(est))
+        top = np.argpartition(-est, k - 1)[:k]
+        # best estimate first, list order among equal estimates
+        top = top[np.lexsort((top, -est[top]))]
+        return [self._songs[i] for i in top.tolist() if est[i] > 0]
+
+    def _get_minhash(self) -> Any:
+        if self._minhash_version != self._version:
+            sigs = self._song_sigs
+            for s in self._songs:
+                if s.id not in sigs:
+                    sigs[s.id] = _minhash_signature(s.tokens)
+            self._minhash = np.stack([sigs[s.id] for s in self._songs])
+            self._minhash_version = self._version
+        return self._minhash
+
     # ----- statistics -----
     def genre_counts(self) -> Dict[str, int]:
-        counts: Dict[str, int] = {}
-        for s in self._songs:
-            counts[s.genre] = counts.get(s.genre, 0) + 1
-        return counts
+        return dict(self._genre_counts)
 
     def total_duration(self, songs: List[Song] | None = None) -> int:
         if songs is None:
-            songs = self._songs
+            return self._total_seconds
         return sum(s.duration_seconds for s in songs)
 
     # ----- save / load -----
     def save_to_file(self, filename: str) -> None:
-        data = {
-            "next_id": self._next_id,
-            "songs": [s.to_dict() for s in self._songs],
-        }
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Songs are written one per line as they are serialized, so the whole
+        # library never exists as a list of dicts in memory.
+        with open(filename, "wb") as f:
+            f.write(b'{"next_id": %d, "songs": [' % self._next_id)
+            for i, s in enumerate(self._songs):
+                f.write(b",\n  " if i else b"\n  ")
+                f.write(_json_dumps(s.to_dict()))
+            f.write(b"\n]}\n")
 
     def load_from_file(self, filename: str) -> None:
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        self._songs = [Song.from_dict(d) for d in data.get("songs", [])]
-        max_id = max((s.id for s in self._songs), default=0)
-        self._next_id = max(max_id + 1, int(data.get("next_id", max_id + 1)))
+        with open(filename, "rb") as f:
+            data = _json_loads(f.read())
+        # build everything that can fail before replacing the current library
+        songs = [Song.from_dict(d) for d in data.get("songs", [])]
+        max_id = max((s.id for s in songs), default=0)
+        next_id = max(max_id + 1, int(data.get("next_id", max_id + 1)))
+        # every index is keyed on id: songs without one (or with a repeated
+        # one) get a fresh id instead of overwriting each other
+        seen: set[int] = set()
+        for s in songs:
+            if s.id <= 0 or s.id in seen:
+                s.id = next_id
+                next_id += 1
+            seen.add(s.id)
+        columns = self._build_columns(songs)
+
+        self._songs = songs
+        self._by_id = {s.id: s for s in self._songs}
+        self._index = {s.id: i for i, s in enumerate(self._songs)}
+        self._ids, self._durations, self._ratings = columns
+        self._total_seconds = sum(s.duration_seconds for s in self._songs)
+        self._genre_counts = Counter(s.genre for s in self._songs)
+        self._sorted_by = None
+        self._version += 1
+        self._vocab = {}
+        self._free_bits = []
+        self._song_bits = {}
+        self._postings = defaultdict(set)
+        self._song_sigs = {}
+        for s in self._songs:
+            self._index_tokens(s)
+        self._next_id = next_id
 
 
 # ========== GUI APPLICATION ==========
 
+COVER_SIZE = (256, 256)
+COVER_CACHE_SIZE = 32
+PLAYLIST_PATH = os.path.join(os.path.expanduser("~"), ".songcollector", "playlist.m3u")
+
+# opens a file with the system's default application
+if hasattr(os, "startfile"):
+    _open_with_default_app = os.startfile
+else:
+    _OPENER = "open" if sys.platform == "darwin" else "xdg-open"
+
+    def _open_with_default_app(path: str) -> None:
+        subprocess.Popen([_OPENER, path])
+
+
+def _set_entry(entry: ttk.Entry, value: str) -> None:
+    entry.delete(0, tk.END)
+    entry.insert(0, value)
+
+
 class SongCollectorApp:
     def __init__(self, root: tk.Tk) -> None:
         self.root = root
@@ -215,15 +685,43 @@ class SongCollectorApp:
 
         self.dark_mode = False
         self.cover_image: tk.PhotoImage | None = None
+        # path -> preview image, least recently shown first
+        self._cover_cache: OrderedDict[str, Any] = OrderedDict()
         self.current_edit_id: int | None = None
+        self._last_render_signature: tuple | None = None
+        # song id shown on each listbox row, and the reverse mapping
+        self._row_ids: List[int] = []
+        self._row_of_id: Dict[int, int] = {}
+        self._search_after_id: str | None = None
 
+        self._style: ttk.Style | None = None
         self._configure_style()
         self.collector = SongCollector()
+        if _warm_up_jaccard is not None:
+            # keep the JIT compile of the search kernel out of the first search
+            threading.Thread(target=_warm_up_jaccard, daemon=True).start()
         self._create_widgets()
         self._apply_theme_to_runtime_widgets()
 
     # ------- visual style --------
     def _configure_style(self) -> None:
+        if self._style is None:
+            self._style = self._create_style()
+        style = self._style
+
+        bg = self._bg_dark if self.dark_mode else self._bg_light
+        fg = self._fg_dark if self.dark_mode else self._fg_light
+        entry_bg = self._entry_bg_dark if self.dark_mode else self._entry_bg_light
+
+        # only the colours depend on the theme; fonts etc. are set up once
+        style.configure("TFrame", background=bg)
+        style.configure("TLabelframe", background=bg)
+        style.configure("TLabelframe.Label", background=bg, foreground=fg)
+        style.configure("TLabel", background=bg, foreground=fg)
+        style.configure("TEntry", fieldbackground=entry_bg, foreground=fg)
+        style.configure("TCombobox", fieldbackground=entry_bg, foreground=fg)
+
+    def _create_style(self) -> ttk.Style:
         self._bg_light = "#f3f3f3"
         self._fg_light = "#000000"
         self._entry_bg_light = "#ffffff"
@@ -234,11 +732,6 @@ class SongCollectorApp:
 
         self._accent = "#0078D7"
 
-        bg = self._bg_dark if self.dark_mode else self._bg_light
-        fg = self._fg_dark if self.dark_mode else self._fg_light
-        entry_bg = self._entry_bg_dark if self.dark_mode else self._entry_bg_light
-
-        self.root.configure(bg=bg)
         style = ttk.Style(self.root)
 
         try:
@@ -246,42 +739,21 @@ class SongCollectorApp:
         except tk.TclError:
             pass
 
-        style.configure("TFrame", background=bg)
-        style.configure("TLabelframe", background=bg)
-        style.configure(
-            "TLabelframe.Label",
-            background=bg,
-            foreground=fg,
-            font=("Segoe UI", 11, "bold"),
-        )
-        style.configure(
-            "TLabel",
-            background=bg,
-            foreground=fg,
-            font=("Segoe UI", 10),
-        )
+        style.configure("TLabelframe.Label", font=("Segoe UI", 11, "bold"))
+        style.configure("TLabel", font=("Segoe UI", 10))
         style.configure(
             "TButton",
             font=("Segoe UI", 10),
             padding=6,
         )
-        style.configure(
-            "TEntry",
-            font=("Segoe UI", 10),
-            fieldbackground=entry_bg,
-            foreground=fg,
-        )
-        style.configure(
-            "TCombobox",
-            font=("Segoe UI", 10),
-            fieldbackground=entry_bg,
-            foreground=fg,
-        )
+        style.configure("TEntry", font=("Segoe UI", 10))
+        style.configure("TCombobox", font=("Segoe UI", 10))
         style.map(
             "TButton",
             background=[("active", self._accent)],
             foreground=[("active", "#ffffff")],
         )
+        return style
 
     def toggle_theme(self) -> None:
         self.dark_mode = not self.dark_mode
@@ -317,38 +789,31 @@ class SongCollectorApp:
         ttk.Label(frm_input, text="Audio file:").grid(row=5, column=0, sticky="w")
         ttk.Label(frm_input, text="Cover image:").grid(row=6, column=0, sticky="w")
 
-        self.var_title = tk.StringVar()
-        self.var_artist = tk.StringVar()
-        self.var_duration = tk.StringVar()
-        self.var_genre = tk.StringVar()
-        self.var_rating = tk.StringVar()
-        self.var_filepath = tk.StringVar()
-        self.var_coverpath = tk.StringVar()
-
         entry_width = 32
 
-        ttk.Entry(frm_input, textvariable=self.var_title,
-                  width=entry_width).grid(row=0, column=1, padx=5, pady=3, sticky="ew")
-        ttk.Entry(frm_input, textvariable=self.var_artist,
-                  width=entry_width).grid(row=1, column=1, padx=5, pady=3, sticky="ew")
-        ttk.Entry(frm_input, textvariable=self.var_duration,
-                  width=entry_width).grid(row=2, column=1, padx=5, pady=3, sticky="ew")
-        ttk.Entry(frm_input, textvariable=self.var_genre,
-                  width=entry_width).grid(row=3, column=1, padx=5, pady=3, sticky="ew")
-        ttk.Entry(frm_input, textvariable=self.var_rating,
-                  width=entry_width).grid(row=4, column=1, padx=5, pady=3, sticky="ew")
+        # form entries are read directly, without StringVar traces
+        self.ent_title = ttk.Entry(frm_input, width=entry_width)
+        self.ent_title.grid(row=0, column=1, padx=5, pady=3, sticky="ew")
+        self.ent_artist = ttk.Entry(frm_input, width=entry_width)
+        self.ent_artist.grid(row=1, column=1, padx=5, pady=3, sticky="ew")
+        self.ent_duration = ttk.Entry(frm_input, width=entry_width)
+        self.ent_duration.grid(row=2, column=1, padx=5, pady=3, sticky="ew")
+        self.ent_genre = ttk.Entry(frm_input, width=entry_width)
+        self.ent_genre.grid(row=3, column=1, padx=5, pady=3, sticky="ew")
+        self.ent_rating = ttk.Entry(frm_input, width=entry_width)
+        self.ent_rating.grid(row=4, column=1, padx=5, pady=3, sticky="ew")
 
         file_frame = ttk.Frame(frm_input)
         file_frame.grid(row=5, column=1, padx=5, pady=3, sticky="ew")
-        ttk.Entry(file_frame, textvariable=self.var_filepath,
-                  width=entry_width - 8).grid(row=0, column=0, sticky="ew")
+        self.ent_filepath = ttk.Entry(file_frame, width=entry_width - 8)
+        self.ent_filepath.grid(row=0, column=0, sticky="ew")
         ttk.Button(file_frame, text="Browse…",
                    command=self.browse_audio).grid(row=0, column=1, padx=4)
 
         cover_frame = ttk.Frame(frm_input)
         cover_frame.grid(row=6, column=1, padx=5, pady=3, sticky="ew")
-        ttk.Entry(cover_frame, textvariable=self.var_coverpath,
-                  width=entry_width - 8).grid(row=0, column=0, sticky="ew")
+        self.ent_coverpath = ttk.Entry(cover_frame, width=entry_width - 8)
+        self.ent_coverpath.grid(row=0, column=0, sticky="ew")
         ttk.Button(cover_frame, text="Browse PNG…",
                    command=self.browse_cover).grid(row=0, column=1, padx=4)
 
@@ -370,9 +835,9 @@ class SongCollectorApp:
 
         ttk.Label(frm_actions, text="Search keyword:").grid(row=0, column=0, sticky="w")
         self.var_search = tk.StringVar()
-        ttk.Entry(frm_actions, textvariable=self.var_search, width=20).grid(
-            row=0, column=1, padx=5, pady=3, sticky="w"
-        )
+        ent_search = ttk.Entry(frm_actions, textvariable=self.var_search, width=20)
+        ent_search.grid(row=0, column=1, padx=5, pady=3, sticky="w")
+        ent_search.bind("<KeyRelease>", self._on_search_key)
         ttk.Button(frm_actions, text="Smart search",
                    command=self.smart_search).grid(row=0, column=2, padx=5)
 
@@ -454,7 +919,7 @@ class SongCollectorApp:
             ],
         )
         if path:
-            self.var_filepath.set(path)
+            _set_entry(self.ent_filepath, path)
 
     def browse_cover(self) -> None:
         path = filedialog.askopenfilename(
@@ -462,7 +927,7 @@ class SongCollectorApp:
             filetypes=[("PNG images", "*.png"), ("All files", "*.*")],
         )
         if path:
-            self.var_coverpath.set(path)
+            _set_entry(self.ent_coverpath, path)
             self.show_cover_image(path)
 
     # ---------- core actions ----------
@@ -489,23 +954,29 @@ class SongCollectorApp:
         self.refresh_list()
 
     def clear_form(self) -> None:
-        self.var_title.set("")
-        self.var_artist.set("")
-        self.var_duration.set("")
-        self.var_genre.set("")
-        self.var_rating.set("")
-        self.var_filepath.set("")
-        self.var_coverpath.set("")
+        for entry in self._form_entries():
+            entry.delete(0, tk.END)
         self.current_edit_id = None
 
+    def _form_entries(self) -> Tuple[ttk.Entry, ...]:
+        return (
+            self.ent_title,
+            self.ent_artist,
+            self.ent_duration,
+            self.ent_genre,
+            self.ent_rating,
+            self.ent_filepath,
+            self.ent_coverpath,
+        )
+
     def _read_form_data(self) -> Dict[str, Any] | None:
-        title = self.var_title.get().strip()
-        artist = self.var_artist.get().strip()
-        duration_text = self.var_duration.get().strip()
-        genre = self.var_genre.get().strip()
-        rating_text = self.var_rating.get().strip()
-        filepath = self.var_filepath.get().strip()
-        coverpath = self.var_coverpath.get().strip()
+        title = self.ent_title.get().strip()
+        artist = self.ent_artist.get().strip()
+        duration_text = self.ent_duration.get().strip()
+        genre = self.ent_genre.get().strip()
+        rating_text = self.ent_rating.get().strip()
+        filepath = self.ent_filepath.get().strip()
+        coverpath = self.ent_coverpath.get().strip()
 
         if not title or not artist:
             messagebox.showwarning("Input error", "Title and Artist are required.")
@@ -519,6 +990,11 @@ class SongCollectorApp:
         if duration < 0:
             messagebox.showwarning("Input error", "Duration must be non-negative.")
             return None
+        if duration > MAX_DURATION_SECONDS:
+            messagebox.showwarning(
+                "Input error", f"Duration must be at most {MAX_DURATION_SECONDS} seconds."
+            )
+            return None
         if not (1 <= rating <= 5):
             messagebox.showwarning("Input error", "Rating must be between 1 and 5.")
             return None
@@ -534,38 +1010,35 @@ class SongCollectorApp:
         }
 
     def refresh_list(self, songs: List[Song] | None = None) -> None:
+        total_sec = None
         if songs is None:
             songs = self.collector.list_songs()
+            total_sec = self.collector.total_duration()
+        signature = tuple(
+            (s.id, s.title, s.artist, s.genre, s.rating, s.duration_seconds, bool(s.filepath))
+            for s in songs
+        )
+        if signature == self._last_render_signature:
+            return
+        self._last_render_signature = signature
+        self._row_ids = [s.id for s in songs]
+        self._row_of_id = {song_id: i for i, song_id in enumerate(self._row_ids)}
+
+        items = [s.display_text for s in songs]
         self.lst_songs.delete(0, tk.END)
-        for s in songs:
-            has_file = "🎵" if s.filepath else "—"
-            text = (
-                f"[{s.id}] {s.title} – {s.artist} "
-                f"({s.genre}, {s.duration_seconds}s, rating {s.rating}, file {has_file})"
-            )
-            self.lst_songs.insert(tk.END, text)
-        self.update_total_duration_label(songs)
+        if items:
+            self.lst_songs.insert(tk.END, *items)
+        self.update_total_duration_label(songs, total_sec)
 
     def _get_selected_ids(self) -> List[int]:
-        selection = list(self.lst_songs.curselection())
-        ids: List[int] = []
-        for index in selection:
-            text = self.lst_songs.get(index)
-            try:
-                id_part = text.split("]")[0]
-                song_id = int(id_part.strip("["))
-                ids.append(song_id)
-            except Exception:
-                pass
-        return ids
+        return [self._row_ids[i] for i in self.lst_songs.curselection()]
 
     def delete_selected(self) -> None:
         ids = self._get_selected_ids()
         if not ids:
             messagebox.showinfo("Delete", "Please select at least one song.")
             return
-        for song_id in ids:
-            self.collector.remove_song_by_id(song_id)
+        self.collector.remove_songs_by_ids(ids)
         self.refresh_list()
         self.clear_form()
 
@@ -591,13 +1064,13 @@ class SongCollectorApp:
             self.cover_image = None
 
     def _load_song_into_form(self, song: Song) -> None:
-        self.var_title.set(song.title)
-        self.var_artist.set(song.artist)
-        self.var_duration.set(str(song.duration_seconds))
-        self.var_genre.set(song.genre)
-        self.var_rating.set(str(song.rating))
-        self.var_filepath.set(song.filepath)
-        self.var_coverpath.set(song.cover_path)
+        _set_entry(self.ent_title, song.title)
+        _set_entry(self.ent_artist, song.artist)
+        _set_entry(self.ent_duration, str(song.duration_seconds))
+        _set_entry(self.ent_genre, song.genre)
+        _set_entry(self.ent_rating, str(song.rating))
+        _set_entry(self.ent_filepath, song.filepath)
+        _set_entry(self.ent_coverpath, song.cover_path)
 
     # ---------- playback ----------
 
@@ -625,11 +1098,7 @@ class SongCollectorApp:
         if not song.filepath:
             messagebox.showinfo("Random", "Random song has no audio file.")
             return
-        index = None
-        for i in range(self.lst_songs.size()):
-            if self.lst_songs.get(i).startswith(f"[{song.id}]"):
-                index = i
-                break
+        index = self._row_of_id.get(song.id)
         if index is not None:
             self.lst_songs.selection_clear(0, tk.END)
             self.lst_songs.selection_set(index)
@@ -654,19 +1123,17 @@ class SongCollectorApp:
             return
 
         try:
-            with tempfile.NamedTemporaryFile(
-                delete=False, suffix=".m3u", mode="w", encoding="utf-8"
-            ) as f:
-                for p in paths:
-                    f.write(p + "\n")
-                playlist_path = f.name
-            self._open_audio(playlist_path)
+            # one playlist file reused (truncated) for every play
+            os.makedirs(os.path.dirname(PLAYLIST_PATH), exist_ok=True)
+            with open(PLAYLIST_PATH, "w", encoding="utf-8") as f:
+                f.write("\n".join(paths) + "\n")
+            self._open_audio(PLAYLIST_PATH)
         except Exception as e:
             messagebox.showerror("Play", f"Could not create playlist:\n{e}")
 
     def _open_audio(self, path: str) -> None:
         try:
-            os.startfile(path)  # type: ignore[attr-defined]
+            _open_with_default_app(path)
         except Exception as e:
             messagebox.showerror("Play", f"Cannot open file:\n{e}")
 
@@ -682,6 +1149,20 @@ class SongCollectorApp:
             messagebox.showinfo("Search", "No matching songs.")
         self.refresh_list(results)
 
+    def _on_search_key(self, event: tk.Event | None = None) -> None:
+        # wait for a pause in typing before searching
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(150, self._live_search)
+
+    def _live_search(self) -> None:
+        self._search_after_id = None
+        keyword = self.var_search.get().strip()
+        if keyword:
+            self.refresh_list(self.collector.search_smart(keyword))
+        else:
+            self.refresh_list()
+
     def apply_sort(self) -> None:
         key = self.var_sort.get()
         self.collector.sort_songs(key)
@@ -728,17 +1209,40 @@ class SongCollectorApp:
     # ---------- cover & totals ----------
 
     def show_cover_image(self, path: str) -> None:
-        try:
-            img = tk.PhotoImage(file=path)
-        except Exception:
-            self.lbl_cover.configure(text="Cannot load image", image="")
-            self.cover_image = None
-            return
+        img = self._cover_cache.get(path)
+        if img is not None:
+            self._cover_cache.move_to_end(path)
+        else:
+            try:
+                img = self._load_cover(path)
+            except Exception:
+                self.lbl_cover.configure(text="Cannot load image", image="")
+                self.cover_image = None
+                return
+            self._cover_cache[path] = img
+            if len(self._cover_cache) > COVER_CACHE_SIZE:
+                self._cover_cache.popitem(last=False)
         self.cover_image = img
         self.lbl_cover.configure(image=self.cover_image, text="")
 
-    def update_total_duration_label(self, songs: List[Song]) -> None:
-        total_sec = self.collector.total_duration(songs)
+    def _load_cover(self, path: str) -> Any:
+        # decode once and keep only a preview-sized copy, not the full image
+        if Image is None:
+            full = tk.PhotoImage(file=path)
+            # integer subsampling is all Tk offers; round up so it fits
+            factor = max(
+                -(-full.width() // COVER_SIZE[0]), -(-full.height() // COVER_SIZE[1]), 1
+            )
+            return full.subsample(factor) if factor > 1 else full
+        with Image.open(path) as src:
+            src.thumbnail(COVER_SIZE, Image.LANCZOS)
+            return ImageTk.PhotoImage(src)
+
+    def update_total_duration_label(
+        self, songs: List[Song], total_sec: int | None = None
+    ) -> None:
+        if total_sec is None:
+            total_sec = self.collector.total_duration(songs)
         minutes, seconds = divmod(total_sec, 60)
         hours, minutes = divmod(minutes, 60)
         self.var_total.set(
@@ -0,0 +1,35 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from song_collector_gui import SongCollector  # noqa: E402
+
+LIBRARY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "My Favourite Library.json")
+
+
+def test_load_library_without_ids(tmp_path):
+    with open(LIBRARY, encoding="utf-8") as f:
+        data = json.load(f)
+    for song in data["songs"]:
+        del song["id"]
+    del data["next_id"]
+    path = tmp_path / "no_ids.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    collector = SongCollector()
+    collector.load_from_file(str(path))
+    songs = collector.list_songs()
+    ids = [s.id for s in songs]
+    assert len(set(ids)) == len(songs) and 0 not in ids
+
+    assert [s.title for s in collector.search_smart("shape")] == ["Shape of You"]
+    assert [s.title for s in collector.search_smart("dancing queen")] == ["Dancing Queen"]
+
+    victim = songs[0]
+    assert collector.remove_song_by_id(victim.id)
+    assert victim not in collector.list_songs()
+    assert len(collector.list_songs()) == len(songs) - 1
+    assert collector.add_song("New", "Artist", 1, "Pop", 3, "", "").id not in ids